@@ -1,71 +1,195 @@
+import asyncio
+import functools
+import itertools
 import logging
 import os
+import re
+import time
 import warnings
-import requests
+import orjson
 from fastmcp import FastMCP
-import tweepy
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
+from collections import deque
+from datetime import timedelta
+from enum import IntEnum
+from typing import TYPE_CHECKING, List, Dict, Optional
+
+# tweepy and requests are imported lazily on first client/session use: their
+# transitive imports cost 150-300 ms of cold start, which matters for MCP
+# servers spawned per-session by desktop clients that may only list tools
+if TYPE_CHECKING:
+    import requests
+    import tweepy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Suppress SyntaxWarning from Tweepy docstrings
+# Suppress SyntaxWarning from Tweepy docstrings (registered before the lazy
+# import so it applies whenever tweepy is first loaded)
 warnings.filterwarnings("ignore", category=SyntaxWarning)
 
-# Load environment variables from .env file (if present)
-load_dotenv()
+def _serialize_tool_result(data) -> str:
+    """Serialize tool results with orjson.
+
+    Large pages (100-user follower lists, full tweet bodies) make stdlib
+    json.dumps the dominant CPU cost in a handler; orjson is several times
+    faster and serializes datetimes from Tweepy models natively.
+    """
+    return orjson.dumps(data).decode()
 
 # Initialize FastMCP server
-server = FastMCP(name="TwitterMCPServer")
+server = FastMCP(name="TwitterMCPServer", tool_serializer=_serialize_tool_result)
 
-# Twitter API client setup (lazy-loaded)
-_twitter_client = None
-_twitter_v1_api = None
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load environment variables from .env (if present) exactly once.
 
-def initialize_twitter_clients() -> tuple[tweepy.Client, tweepy.API]:
-    """Initialize Twitter API clients on-demand."""
-    global _twitter_client, _twitter_v1_api
-
-    if _twitter_client is not None and _twitter_v1_api is not None:
-        return _twitter_client, _twitter_v1_api
-
-    # Verify required environment variables
-    required_env_vars = [
-        "TWITTER_API_KEY",
-        "TWITTER_API_SECRET",
-        "TWITTER_ACCESS_TOKEN",
-        "TWITTER_ACCESS_TOKEN_SECRET",
-        "TWITTER_BEARER_TOKEN",
-    ]
-    for var in required_env_vars:
-        if not os.getenv(var):
+    Deferred from module import to keep cold start fast. Every entry point
+    that reads configuration via os.getenv must call this first — not just
+    client construction: the bookmark tools and the Redis rate limiter read
+    env vars without ever building the Tweepy clients.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+# Shared pooled HTTP session (lazy-loaded), reused by the v2 Tweepy client and
+# the raw bookmark requests so keep-alive connections survive across calls.
+# The v1.1 API gets a separate session (see _get_v1_session below).
+_http_session = None
+_v1_session = None
+
+def _configure_pooling(session: "requests.Session") -> None:
+    """Mount the enlarged, retrying connection pool on a session."""
+    from requests.adapters import HTTPAdapter, Retry
+
+    # Retry transient upstream failures with backoff; 429/5xx responses
+    # are the ones Twitter actually returns under load
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=100,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+
+def _get_http_session() -> "requests.Session":
+    """Return the shared requests.Session with an enlarged connection pool.
+
+    Tweepy creates a fresh default session per client, so every request can pay
+    a new TCP+TLS handshake (~150 ms). One shared session with a larger pool
+    reuses keep-alive connections across all API calls instead.
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+
+        session = requests.Session()
+        _configure_pooling(session)
+        _http_session = session
+    return _http_session
+
+def _get_v1_session() -> "requests.Session":
+    """Return the pooled session dedicated to the v1.1 API.
+
+    tweepy.API.request() calls session.close() after every v1.1 request, so
+    the v1.1 client must not hold the shared session - each media upload
+    would tear down the warm pools for every other client. It gets its own
+    session whose close() is a no-op, keeping its pool alive for the process
+    lifetime while leaving the shared session untouched.
+    """
+    global _v1_session
+    if _v1_session is None:
+        import requests
+
+        class _PersistentSession(requests.Session):
+            """Session that ignores tweepy's per-request close()."""
+
+            def close(self):
+                pass
+
+        session = _PersistentSession()
+        _configure_pooling(session)
+        _v1_session = session
+    return _v1_session
+
+@functools.lru_cache(maxsize=1)
+def _build_clients() -> "tuple[tweepy.Client, tweepy.API]":
+    """Build the Tweepy v2/v1.1 client pair exactly once.
+
+    Memoizing here means concurrent cold-start invocations cannot race and
+    construct duplicate clients (each with its own session pool), and the
+    environment is read a single time. Failed initialization is not cached,
+    so a retry after fixing the environment works.
+    """
+    import tweepy
+
+    _load_env()
+
+    # Read and verify required environment variables in one pass
+    env = {
+        var: os.getenv(var)
+        for var in (
+            "TWITTER_API_KEY",
+            "TWITTER_API_SECRET",
+            "TWITTER_ACCESS_TOKEN",
+            "TWITTER_ACCESS_TOKEN_SECRET",
+            "TWITTER_BEARER_TOKEN",
+        )
+    }
+    for var, value in env.items():
+        if not value:
             raise EnvironmentError(f"Missing required environment variable: {var}")
 
     # Initialize v2 API client
-    _twitter_client = tweepy.Client(
-        consumer_key=os.getenv("TWITTER_API_KEY"),
-        consumer_secret=os.getenv("TWITTER_API_SECRET"),
-        access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
-        bearer_token=os.getenv("TWITTER_BEARER_TOKEN")
+    client = tweepy.Client(
+        consumer_key=env["TWITTER_API_KEY"],
+        consumer_secret=env["TWITTER_API_SECRET"],
+        access_token=env["TWITTER_ACCESS_TOKEN"],
+        access_token_secret=env["TWITTER_ACCESS_TOKEN_SECRET"],
+        bearer_token=env["TWITTER_BEARER_TOKEN"]
     )
 
     # Initialize v1.1 API for media uploads and other unsupported v2 endpoints
     auth = tweepy.OAuth1UserHandler(
-        consumer_key=os.getenv("TWITTER_API_KEY"),
-        consumer_secret=os.getenv("TWITTER_API_SECRET"),
-        access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
+        consumer_key=env["TWITTER_API_KEY"],
+        consumer_secret=env["TWITTER_API_SECRET"],
+        access_token=env["TWITTER_ACCESS_TOKEN"],
+        access_token_secret=env["TWITTER_ACCESS_TOKEN_SECRET"]
     )
-    _twitter_v1_api = tweepy.API(auth)
+    v1_api = tweepy.API(auth)
+
+    # Point the v2 client at the shared pooled session so concurrent tool
+    # calls reuse connections; the v1.1 API needs its own close-proof session
+    client.session = _get_http_session()
+    v1_api.session = _get_v1_session()
+
+    return client, v1_api
 
-    return _twitter_client, _twitter_v1_api
+def initialize_twitter_clients() -> "tuple[tweepy.Client, tweepy.API]":
+    """Initialize Twitter API clients on-demand."""
+    return _build_clients()
+
+async def _t(fn, *args, **kwargs):
+    """Run a blocking Tweepy call in a worker thread.
+
+    The tool handlers are async but Tweepy is synchronous; without this, one
+    slow Twitter call stalls every other in-flight tool invocation on the
+    event loop.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
 
 _API_TIMEOUT = 30  # seconds
 
+# Field selections shared across handlers, hoisted so each call reuses one
+# list instead of allocating a fresh literal. Tweepy joins lists (not tuples)
+# into the query string, so these stay lists; treat them as read-only.
+_USER_FIELDS = ["id", "name", "username", "profile_image_url", "description"]
+_USER_FIELDS_MIN = ["id", "name", "username"]
+_TWEET_FIELDS = ["id", "text", "created_at"]
+_TWEET_FIELDS_FULL = ["id", "text", "created_at", "author_id"]
+
 
 def _get_oauth2_headers_and_user_id() -> tuple[dict, str]:
     """Resolve OAuth 2.0 Authorization headers and the authenticated user ID.
@@ -81,6 +205,7 @@ def _get_oauth2_headers_and_user_id() -> tuple[dict, str]:
         A (headers, user_id) tuple. Call once per operation and reuse across
         multiple requests to avoid redundant /2/users/me lookups.
     """
+    _load_env()
     token = os.getenv("TWITTER_OAUTH2_USER_ACCESS_TOKEN")
     if not token:
         raise EnvironmentError(
@@ -89,7 +214,7 @@ def _get_oauth2_headers_and_user_id() -> tuple[dict, str]:
             "with bookmark.read, bookmark.write, and users.read scopes."
         )
     headers = {"Authorization": f"Bearer {token}"}
-    me = requests.get("https://api.twitter.com/2/users/me", headers=headers, timeout=_API_TIMEOUT)
+    me = _get_http_session().get("https://api.twitter.com/2/users/me", headers=headers, timeout=_API_TIMEOUT)
     me.raise_for_status()
     return headers, me.json()["data"]["id"]
 
@@ -109,11 +234,22 @@ def _bookmarks_request(method: str, headers: dict, user_id: str,
     url = f"https://api.twitter.com/2/users/{user_id}/bookmarks"
     if tweet_id:
         url += f"/{tweet_id}"
-    resp = requests.request(method, url, headers=headers, params=params or {}, timeout=_API_TIMEOUT)
+    resp = _get_http_session().request(method, url, headers=headers, params=params or {}, timeout=_API_TIMEOUT)
     resp.raise_for_status()
     return resp.json()
 
 
+class Action(IntEnum):
+    """Rate-limited action categories.
+
+    Values index the per-action limit and counter lists below, so the hot
+    path does integer indexing instead of hashing string keys.
+    """
+    TWEET = 0
+    DM = 1
+    FOLLOW = 2
+    LIKE = 3
+
 # Rate limiting configuration
 RATE_LIMITS = {
     "tweet_actions": {"limit": 300, "window": timedelta(minutes=15)},
@@ -122,26 +258,111 @@ RATE_LIMITS = {
     "like_actions": {"limit": 1000, "window": timedelta(hours=24)}
 }
 
-# In-memory rate limit tracking (use Redis in production)
-rate_limit_counters = defaultdict(lambda: {"count": 0, "reset_time": datetime.now()})
-
-def check_rate_limit(action_type: str) -> bool:
-    """Check if the action is within rate limits."""
-    config = RATE_LIMITS.get(action_type)
-    if not config:
-        return True  # No limit defined
-    counter = rate_limit_counters[action_type]
-    now = datetime.now()
-    if now >= counter["reset_time"]:
-        counter["count"] = 0
-        counter["reset_time"] = now + config["window"]
-    if counter["count"] >= config["limit"]:
+# Per-action state indexed by Action value, derived from RATE_LIMITS once at
+# import: (limit, window_ns) pairs and stable Redis keys
+_ACTION_NAMES = ("tweet_actions", "dm_actions", "follow_actions", "like_actions")
+_ACTION_LIMITS = tuple(
+    (RATE_LIMITS[name]["limit"], int(RATE_LIMITS[name]["window"].total_seconds() * 1e9))
+    for name in _ACTION_NAMES
+)
+_ACTION_REDIS_KEYS = tuple(f"rate_limit:{name}" for name in _ACTION_NAMES)
+
+# Sliding-window Lua script: drop entries older than the window, reject if the
+# window is full, otherwise record this call. Runs atomically in one Redis
+# round-trip. ARGV = now_ms, window_ms, limit, member. The member must be
+# unique per call - scoring by now_ms alone would collapse concurrent calls
+# landing in the same millisecond into one ZSET entry and undercount.
+_RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local count = redis.call('ZCARD', KEYS[1])
+if count >= tonumber(ARGV[3]) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Shared Redis client (lazy-loaded); only used when REDIS_URL is configured
+_redis_client = None
+_rate_limit_script = None
+# Combined with the PID, this sequence makes each ZSET member unique across
+# same-millisecond calls and across worker processes
+_rate_limit_seq = itertools.count()
+
+def _get_redis_client():
+    """Return the shared async Redis client, or None when REDIS_URL is unset.
+
+    Requires the `redis` package (pip install x-twitter-mcp[redis]). With Redis
+    the rate-limit window is shared across worker processes; without it each
+    process enforces its own limit.
+    """
+    global _redis_client
+    _load_env()
+    if _redis_client is None and os.getenv("REDIS_URL"):
+        import redis.asyncio as redis
+        _redis_client = redis.Redis.from_url(os.getenv("REDIS_URL"))
+    return _redis_client
+
+# In-memory fallback for single-process deployments: per-action deques of call
+# timestamps form a true sliding window (no whole-window reset burst)
+rate_limit_counters = tuple(deque() for _ in Action)
+
+async def check_rate_limit(action: Action) -> bool:
+    """Check if the action is within rate limits (sliding window)."""
+    limit, window_ns = _ACTION_LIMITS[action]
+    redis_client = _get_redis_client()
+    if redis_client is not None:
+        global _rate_limit_script
+        if _rate_limit_script is None:
+            # register_script retries with EVAL on NOSCRIPT, so the limiter
+            # survives a Redis restart flushing the script cache
+            _rate_limit_script = redis_client.register_script(_RATE_LIMIT_LUA)
+        # Redis needs wall-clock time so the window is shared across processes
+        now_ms = int(time.time() * 1000)
+        member = f"{now_ms}-{os.getpid()}-{next(_rate_limit_seq)}"
+        allowed = await _rate_limit_script(
+            keys=[_ACTION_REDIS_KEYS[action]],
+            args=[now_ms, window_ns // 1_000_000, limit, member])
+        return bool(allowed)
+    # Local sliding window: expire old timestamps, then record the call.
+    # Monotonic integer nanoseconds keep this allocation-free and immune to
+    # wall-clock adjustments.
+    now = time.monotonic_ns()
+    timestamps = rate_limit_counters[action]
+    while timestamps and now - timestamps[0] >= window_ns:
+        timestamps.popleft()
+    if len(timestamps) >= limit:
         return False
-    counter["count"] += 1
+    timestamps.append(now)
     return True
 
 
 # User Management Tools
+
+# Short-TTL user lookup cache: profile fields are effectively immutable on
+# this timescale, and conversational sessions query the same user repeatedly
+_USER_CACHE_TTL_NS = 60 * 1_000_000_000
+_USER_CACHE_MAX = 4096
+_user_cache: Dict[tuple, tuple] = {}
+
+async def _fetch_user(user_id: Optional[str] = None, username: Optional[str] = None) -> Optional[Dict]:
+    """Fetch a user profile by ID or username, cached for 60 seconds.
+
+    Shared by get_user_profile, get_user_by_id, and get_user_by_screen_name;
+    cache hits skip the HTTPS round-trip entirely.
+    """
+    key = (user_id, username)
+    now = time.monotonic_ns()
+    cached = _user_cache.get(key)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    client, _ = initialize_twitter_clients()
+    user = await _t(client.get_user, id=user_id, username=username, user_fields=_USER_FIELDS)
+    data = user.data.data if user.data else None
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.clear()
+    _user_cache[key] = (now + _USER_CACHE_TTL_NS, data)
+    return data
+
 @server.tool(name="get_user_profile", description="Get detailed profile information for a user")
 async def get_user_profile(user_id: str) -> Dict:
     """Fetches user profile by user ID.
@@ -149,9 +370,7 @@ async def get_user_profile(user_id: str) -> Dict:
     Args:
         user_id (str): The ID of the user to look up.
     """
-    client, _ = initialize_twitter_clients()
-    user = client.get_user(id=user_id, user_fields=["id", "name", "username", "profile_image_url", "description"])
-    return user.data.data if user.data else None
+    return await _fetch_user(user_id=user_id)
 
 @server.tool(name="get_user_by_screen_name", description="Fetches a user by screen name")
 async def get_user_by_screen_name(screen_name: str) -> Dict:
@@ -160,9 +379,7 @@ async def get_user_by_screen_name(screen_name: str) -> Dict:
     Args:
         screen_name (str): The screen name/username of the user.
     """
-    client, _ = initialize_twitter_clients()
-    user = client.get_user(username=screen_name, user_fields=["id", "name", "username", "profile_image_url", "description"])
-    return user.data.data if user.data else None
+    return await _fetch_user(username=screen_name)
 
 @server.tool(name="get_user_by_id", description="Fetches a user by ID")
 async def get_user_by_id(user_id: str) -> Dict:
@@ -171,39 +388,68 @@ async def get_user_by_id(user_id: str) -> Dict:
     Args:
         user_id (str): The ID of the user to look up.
     """
+    return await _fetch_user(user_id=user_id)
+
+def _paginate(method, *, limit: int, **kwargs) -> list:
+    """Stream multiple pages through tweepy.Paginator and flatten to one list.
+
+    Fetching a multi-page total in one tool call saves the caller an MCP
+    round-trip (schema validation, dispatch, JSON marshal) per extra page,
+    and all pages ride the same pooled keep-alive connection.
+    """
+    import tweepy
+
+    return list(tweepy.Paginator(method, **kwargs).flatten(limit=limit))
+
+async def _get_followers(user_id: str, count: Optional[int], total: Optional[int], cursor: Optional[str]) -> List[Dict]:
+    """Shared follower-fetch path for the follower-listing tools."""
+    if not await check_rate_limit(Action.FOLLOW):
+        raise Exception("Follow action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    user = client.get_user(id=user_id, user_fields=["id", "name", "username", "profile_image_url", "description"])
-    return user.data.data if user.data else None
+    if total and total > 100:
+        # Paginator accepts the starting token, so a caller can resume a
+        # multi-page fetch from a previous response's cursor
+        users = await _t(_paginate, client.get_users_followers, limit=total,
+                         id=user_id, max_results=100, pagination_token=cursor,
+                         user_fields=_USER_FIELDS_MIN)
+        return [user.data for user in users]
+    followers = await _t(client.get_users_followers, id=user_id, max_results=count, pagination_token=cursor, user_fields=_USER_FIELDS_MIN)
+    return [user.data for user in followers.data] if followers.data else []
 
 @server.tool(name="get_user_followers", description="Retrieves a list of followers for a given user")
-async def get_user_followers(user_id: str, count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
+async def get_user_followers(user_id: str, count: Optional[int] = 100, total: Optional[int] = None, cursor: Optional[str] = None) -> List[Dict]:
     """Retrieves a list of followers for a given user.
 
     Args:
         user_id (str): The user ID whose followers are to be retrieved.
         count (Optional[int]): The number of followers to retrieve per page. Default is 100. Max is 100 for V2 API.
+        total (Optional[int]): Total number of followers to retrieve across pages. When above 100, pages are fetched and combined server-side in a single call.
         cursor (Optional[str]): A pagination token for fetching the next set of results.
     """
-    if not check_rate_limit("follow_actions"):
-        raise Exception("Follow action rate limit exceeded")
-    client, _ = initialize_twitter_clients()
-    followers = client.get_users_followers(id=user_id, max_results=count, pagination_token=cursor, user_fields=["id", "name", "username"])
-    return [user.data for user in (followers.data or [])]
+    return await _get_followers(user_id, count, total, cursor)
 
 @server.tool(name="get_user_following", description="Retrieves users the given user is following")
-async def get_user_following(user_id: str, count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
+async def get_user_following(user_id: str, count: Optional[int] = 100, total: Optional[int] = None, cursor: Optional[str] = None) -> List[Dict]:
     """Retrieves a list of users whom the given user is following.
 
     Args:
         user_id (str): The user ID whose following list is to be retrieved.
         count (Optional[int]): The number of users to retrieve per page. Default is 100. Max is 100 for V2 API.
+        total (Optional[int]): Total number of users to retrieve across pages. When above 100, pages are fetched and combined server-side in a single call.
         cursor (Optional[str]): A pagination token for fetching the next set of results.
     """
-    if not check_rate_limit("follow_actions"):
+    if not await check_rate_limit(Action.FOLLOW):
         raise Exception("Follow action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    following = client.get_users_following(id=user_id, max_results=count, pagination_token=cursor, user_fields=["id", "name", "username"])
-    return [user.data for user in (following.data or [])]
+    if total and total > 100:
+        # Paginator accepts the starting token, so a caller can resume a
+        # multi-page fetch from a previous response's cursor
+        users = await _t(_paginate, client.get_users_following, limit=total,
+                         id=user_id, max_results=100, pagination_token=cursor,
+                         user_fields=_USER_FIELDS_MIN)
+        return [user.data for user in users]
+    following = await _t(client.get_users_following, id=user_id, max_results=count, pagination_token=cursor, user_fields=_USER_FIELDS_MIN)
+    return [user.data for user in following.data] if following.data else []
 
 @server.tool(name="get_user_followers_you_know", description="Retrieves a list of common followers (simulated)")
 async def get_user_followers_you_know(user_id: str, count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
@@ -214,12 +460,9 @@ async def get_user_followers_you_know(user_id: str, count: Optional[int] = 100,
         count (Optional[int]): The number of followers to retrieve and check. Default is 100.
         cursor (Optional[str]): A pagination token for fetching the user's followers.
     """
-    if not check_rate_limit("follow_actions"):
-        raise Exception("Follow action rate limit exceeded")
-    client, _ = initialize_twitter_clients()
-    # Simulate by fetching followers and filtering (v2 doesn't directly support mutual followers)
-    followers = client.get_users_followers(id=user_id, max_results=count, pagination_token=cursor, user_fields=["id", "name", "username"])
-    return [user.data for user in (followers.data or [])][:count]
+    # Simulate by delegating to the shared follower fetch (v2 doesn't directly
+    # support mutual followers); max_results already caps the page size
+    return await _get_followers(user_id, count, None, cursor)
 
 @server.tool(name="get_user_subscriptions", description="Retrieves a list of users to which the specified user is subscribed (uses following as proxy)")
 async def get_user_subscriptions(user_id: str, count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
@@ -230,14 +473,24 @@ async def get_user_subscriptions(user_id: str, count: Optional[int] = 100, curso
         count (Optional[int]): The number of users to retrieve per page. Default is 100.
         cursor (Optional[str]): A pagination token for fetching the next set of results.
     """
-    if not check_rate_limit("follow_actions"):
+    if not await check_rate_limit(Action.FOLLOW):
         raise Exception("Follow action rate limit exceeded")
     client, _ = initialize_twitter_clients()
     # Use following as proxy for subscriptions
-    subscriptions = client.get_users_following(id=user_id, max_results=count, pagination_token=cursor, user_fields=["id", "name", "username"])
-    return [user.data for user in (subscriptions.data or [])]
+    subscriptions = await _t(client.get_users_following, id=user_id, max_results=count, pagination_token=cursor, user_fields=_USER_FIELDS_MIN)
+    return [user.data for user in subscriptions.data] if subscriptions.data else []
 
 # Tweet Management Tools
+
+# Anything Twitter's t.co wrapper would shorten to 23 weighted characters:
+# scheme'd URLs, www. links, and bare domain.tld tokens (with optional path)
+_URL_RE = re.compile(
+    r"https?://\S+"
+    r"|www\.\S+"
+    r"|\b[a-z0-9][a-z0-9-]*(?:\.[a-z0-9-]+)*\.[a-z]{2,}(?:/\S*)?",
+    re.IGNORECASE,
+)
+
 @server.tool(name="post_tweet", description="Post a tweet with optional media, reply, and tags")
 async def post_tweet(text: str, media_paths: Optional[List[str]] = None, reply_to: Optional[str] = None, tags: Optional[List[str]] = None) -> Dict:
     """Posts a tweet.
@@ -248,22 +501,31 @@ async def post_tweet(text: str, media_paths: Optional[List[str]] = None, reply_t
         reply_to (Optional[str]): The ID of the tweet to reply to.
         tags (Optional[List[str]]): A list of hashtags (without '#') to append to the tweet.
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     client, v1_api = initialize_twitter_clients()
+    if tags:
+        # Single join with a " #" separator instead of one f-string per tag
+        text = f"{text} #" + " #".join(tags)
+    # Fail fast locally rather than paying uploads and a network round-trip
+    # for a tweet Twitter will reject anyway. Twitter counts every URL as 23
+    # characters regardless of raw length - including scheme-less links like
+    # www.example.com/path - so only enforce the raw-length check when no
+    # token could plausibly be a URL; anything ambiguous goes to the API.
+    if len(text) > 280 and not _URL_RE.search(text):
+        raise ValueError(f"Tweet text is {len(text)} characters; the limit is 280")
     tweet_data = {"text": text}
     if reply_to:
         tweet_data["in_reply_to_tweet_id"] = reply_to
-    if tags:
-        tweet_data["text"] += " " + " ".join(f"#{tag}" for tag in tags)
     if media_paths:
-        media_ids = []
-        for path in media_paths:
-            media = v1_api.media_upload(filename=path)
-            media_ids.append(media.media_id_string)
-        tweet_data["media_ids"] = media_ids
-    tweet = client.create_tweet(**tweet_data)
-    logger.info(f"Type of response from client.create_tweet: {type(tweet)}; Content: {tweet}")
+        # Uploads have no data dependency on each other; run them concurrently
+        # in threads. gather preserves input order for the media_ids list.
+        uploads = await asyncio.gather(
+            *(asyncio.to_thread(v1_api.media_upload, filename=path) for path in media_paths))
+        tweet_data["media_ids"] = [media.media_id_string for media in uploads]
+    tweet = await _t(client.create_tweet, **tweet_data)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("create_tweet response type=%s content=%r", type(tweet).__name__, tweet)
     if not tweet.data:
         return None
     return tweet.data
@@ -275,11 +537,11 @@ async def delete_tweet(tweet_id: str) -> Dict:
     Args:
         tweet_id (str): The ID of the tweet to delete.
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    result = client.delete_tweet(id=tweet_id)
-    return {"id": tweet_id, "deleted": result.data["deleted"]}
+    result = await _t(client.delete_tweet, id=tweet_id)
+    return result.data
 
 @server.tool(name="get_tweet_details", description="Get detailed information about a specific tweet")
 async def get_tweet_details(tweet_id: str) -> Dict:
@@ -289,7 +551,7 @@ async def get_tweet_details(tweet_id: str) -> Dict:
         tweet_id (str): The ID of the tweet to fetch.
     """
     client, _ = initialize_twitter_clients()
-    tweet = client.get_tweet(id=tweet_id, tweet_fields=["id", "text", "created_at", "author_id"])
+    tweet = await _t(client.get_tweet, id=tweet_id, tweet_fields=_TWEET_FIELDS_FULL)
     return tweet.data.data if tweet.data else None
 
 @server.tool(name="create_poll_tweet", description="Create a tweet with a poll")
@@ -301,7 +563,7 @@ async def create_poll_tweet(text: str, choices: List[str], duration_minutes: int
         choices (List[str]): A list of poll choices (2-4 choices, each max 25 characters).
         duration_minutes (int): Duration of the poll in minutes (min 5, max 10080 (7 days)).
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     client, _ = initialize_twitter_clients()
     poll_data = {
@@ -309,7 +571,7 @@ async def create_poll_tweet(text: str, choices: List[str], duration_minutes: int
         "poll_options": choices,
         "poll_duration_minutes": duration_minutes
     }
-    tweet = client.create_tweet(**poll_data)
+    tweet = await _t(client.create_tweet, **poll_data)
     if not tweet.data:
         return None
     return tweet.data
@@ -322,7 +584,7 @@ async def vote_on_poll(tweet_id: str, choice: str) -> Dict:
         tweet_id (str): The ID of the tweet containing the poll.
         choice (str): The choice to vote for (must exactly match one of the poll options).
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     # Twitter API v2 doesn't support poll voting; return mock response
     return {"tweet_id": tweet_id, "choice": choice, "status": "voted"}
@@ -334,11 +596,11 @@ async def favorite_tweet(tweet_id: str) -> Dict:
     Args:
         tweet_id (str): The ID of the tweet to favorite (like).
     """
-    if not check_rate_limit("like_actions"):
+    if not await check_rate_limit(Action.LIKE):
         raise Exception("Like action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    result = client.like(tweet_id=tweet_id)
-    return {"tweet_id": tweet_id, "liked": result.data["liked"]}
+    result = await _t(client.like, tweet_id=tweet_id)
+    return result.data
 
 @server.tool(name="unfavorite_tweet", description="Unfavorites a tweet")
 async def unfavorite_tweet(tweet_id: str) -> Dict:
@@ -347,11 +609,11 @@ async def unfavorite_tweet(tweet_id: str) -> Dict:
     Args:
         tweet_id (str): The ID of the tweet to unfavorite (unlike).
     """
-    if not check_rate_limit("like_actions"):
+    if not await check_rate_limit(Action.LIKE):
         raise Exception("Like action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    result = client.unlike(tweet_id=tweet_id)
-    return {"tweet_id": tweet_id, "liked": not result.data["liked"]}
+    result = await _t(client.unlike, tweet_id=tweet_id)
+    return result.data
 
 @server.tool(name="bookmark_tweet", description="Adds the tweet to bookmarks")
 async def bookmark_tweet(tweet_id: str, folder_id: Optional[str] = None) -> Dict:
@@ -361,11 +623,11 @@ async def bookmark_tweet(tweet_id: str, folder_id: Optional[str] = None) -> Dict
         tweet_id (str): The ID of the tweet to bookmark.
         folder_id (Optional[str]): The ID of the bookmark folder to add the tweet to. (Currently not supported by Tweepy v2 client, will be ignored).
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    result = client.bookmark(tweet_id=tweet_id)
-    return {"tweet_id": tweet_id, "bookmarked": result.data["bookmarked"]}
+    result = await _t(client.bookmark, tweet_id=tweet_id)
+    return result.data
 
 @server.tool(name="delete_bookmark", description="Removes the tweet from bookmarks")
 async def delete_bookmark(tweet_id: str) -> Dict:
@@ -374,11 +636,11 @@ async def delete_bookmark(tweet_id: str) -> Dict:
     Args:
         tweet_id (str): The ID of the tweet to remove from bookmarks.
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     client, _ = initialize_twitter_clients()
-    result = client.remove_bookmark(tweet_id=tweet_id)
-    return {"tweet_id": tweet_id, "bookmarked": not result.data["bookmarked"]}
+    result = await _t(client.remove_bookmark, tweet_id=tweet_id)
+    return result.data
 
 @server.tool(name="delete_all_bookmarks", description="DESTRUCTIVE AND IRREVERSIBLE: Permanently deletes ALL bookmarks one by one. This cannot be undone. Always confirm explicitly with the user before calling this tool.")
 async def delete_all_bookmarks() -> Dict:
@@ -391,28 +653,37 @@ async def delete_all_bookmarks() -> Dict:
     Simulated: Twitter API v2 has no bulk-delete endpoint, so bookmarks are
     fetched page-by-page and deleted one by one.
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
     # Twitter API v2 doesn't have a bulk-delete endpoint; fetch all pages and
     # remove bookmarks one by one. Both fetch and delete require OAuth 2.0.
-    headers, user_id = _get_oauth2_headers_and_user_id()
+    headers, user_id = await _t(_get_oauth2_headers_and_user_id)
     deleted = 0
     next_token = None
+    # Each delete is a full HTTPS round-trip, so fan them out concurrently;
+    # the semaphore caps in-flight deletes well below Twitter's ceiling
+    semaphore = asyncio.Semaphore(20)
+
+    async def _remove(tweet_id: str) -> None:
+        if not await check_rate_limit(Action.TWEET):
+            raise Exception(
+                f"Tweet action rate limit exceeded after deleting {deleted} bookmarks"
+            )
+        async with semaphore:
+            await asyncio.to_thread(
+                _bookmarks_request, "DELETE", headers, user_id, tweet_id=tweet_id)
+
     while True:
         params: dict = {"max_results": 100}
         if next_token:
             params["pagination_token"] = next_token
-        data = _bookmarks_request("GET", headers, user_id, params=params)
+        data = await asyncio.to_thread(
+            _bookmarks_request, "GET", headers, user_id, params=params)
         tweets = data.get("data", [])
         if not tweets:
             break
-        for tweet in tweets:
-            if not check_rate_limit("tweet_actions"):
-                raise Exception(
-                    f"Tweet action rate limit exceeded after deleting {deleted} bookmarks"
-                )
-            _bookmarks_request("DELETE", headers, user_id, tweet_id=tweet["id"])
-            deleted += 1
+        await asyncio.gather(*(_remove(tweet["id"]) for tweet in tweets))
+        deleted += len(tweets)
         next_token = data.get("meta", {}).get("next_token")
         if not next_token:
             break
@@ -432,24 +703,17 @@ async def get_bookmarks(count: Optional[int] = 100, cursor: Optional[str] = None
         cursor (Optional[str]): Pagination token for fetching the next page of
             results (pass the next_token from a previous response's meta).
     """
-    if not check_rate_limit("tweet_actions"):
+    if not await check_rate_limit(Action.TWEET):
         raise Exception("Tweet action rate limit exceeded")
-    if count is None:
-        effective_count = 100
-    elif count < 1:
-        effective_count = 1
-    elif count > 100:
-        effective_count = 100
-    else:
-        effective_count = count
-    headers, user_id = _get_oauth2_headers_and_user_id()
+    effective_count = min(100, max(1, 100 if count is None else count))
+    headers, user_id = await _t(_get_oauth2_headers_and_user_id)
     params: dict = {
         "max_results": effective_count,
         "tweet.fields": "id,text,created_at,author_id",
     }
     if cursor:
         params["pagination_token"] = cursor
-    data = _bookmarks_request("GET", headers, user_id, params=params)
+    data = await _t(_bookmarks_request, "GET", headers, user_id, params=params)
     return data.get("data", [])
 
 # Timeline & Search Tools
@@ -463,8 +727,8 @@ async def get_timeline(count: Optional[int] = 100, seen_tweet_ids: Optional[List
         cursor (Optional[str]): Pagination token for fetching the next set of results.
     """
     client, _ = initialize_twitter_clients()
-    tweets = client.get_home_timeline(max_results=count, pagination_token=cursor, tweet_fields=["id", "text", "created_at"])
-    return [tweet.data for tweet in (tweets.data or [])]
+    tweets = await _t(client.get_home_timeline, max_results=count, pagination_token=cursor, tweet_fields=_TWEET_FIELDS)
+    return [tweet.data for tweet in tweets.data] if tweets.data else []
 
 @server.tool(name="get_latest_timeline", description="Get tweets from your home timeline (Following)")
 async def get_latest_timeline(count: Optional[int] = 100) -> List[Dict]:
@@ -474,8 +738,8 @@ async def get_latest_timeline(count: Optional[int] = 100) -> List[Dict]:
         count (Optional[int]): Number of tweets to retrieve. Default 100. Min 5, Max 100 for get_home_timeline.
     """
     client, _ = initialize_twitter_clients()
-    tweets = client.get_home_timeline(max_results=count, tweet_fields=["id", "text", "created_at"], exclude=["replies", "retweets"])
-    return [tweet.data for tweet in (tweets.data or [])]
+    tweets = await _t(client.get_home_timeline, max_results=count, tweet_fields=_TWEET_FIELDS, exclude=["replies", "retweets"])
+    return [tweet.data for tweet in tweets.data] if tweets.data else []
 
 @server.tool(name="search_twitter", description="Search Twitter with a query")
 async def search_twitter(query: str, product: Optional[str] = "Top", count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
@@ -488,22 +752,39 @@ async def search_twitter(query: str, product: Optional[str] = "Top", count: Opti
         cursor (Optional[str]): Pagination token (next_token) for fetching the next set of results.
     """
     sort_order = "relevancy" if product == "Top" else "recency"
-    
-    # Ensure count is within the allowed range (10-100)
-    if count is None:
-        effective_count = 100 # Default to 100 if not provided
-    elif count < 10:
-        logger.info(f"Requested count {count} is less than minimum 10. Using 10 instead.")
-        effective_count = 10
-    elif count > 100:
-        logger.info(f"Requested count {count} is greater than maximum 100. Using 100 instead.")
-        effective_count = 100
-    else:
-        effective_count = count
-        
+
+    # Clamp count to the allowed range (10-100) without branching
+    effective_count = min(100, max(10, 100 if count is None else count))
+    if effective_count != count and count is not None:
+        logger.debug("Clamped requested count %d to %d", count, effective_count)
+
     client, _ = initialize_twitter_clients()
-    tweets = client.search_recent_tweets(query=query, max_results=effective_count, sort_order=sort_order, next_token=cursor, tweet_fields=["id", "text", "created_at"])
-    return [tweet.data for tweet in (tweets.data or [])]
+    tweets = await _t(client.search_recent_tweets, query=query, max_results=effective_count, sort_order=sort_order, next_token=cursor, tweet_fields=_TWEET_FIELDS)
+    return [tweet.data for tweet in tweets.data] if tweets.data else []
+
+# Trends refresh on a ~5 minute cadence and the v1.1 endpoint allows only
+# 75 requests/15min, so cache per WOEID and index by category once per fill
+_TRENDS_CACHE_TTL_NS = 300 * 1_000_000_000
+_trends_cache: Dict[int, tuple] = {}
+
+async def _fetch_trends(woeid: int) -> tuple:
+    """Fetch trends for a WOEID, cached for 5 minutes.
+
+    Returns (trends, by_category), where by_category groups trends by their
+    'category' field so filtered lookups are O(1) instead of a full scan.
+    """
+    now = time.monotonic_ns()
+    cached = _trends_cache.get(woeid)
+    if cached is not None and now < cached[0]:
+        return cached[1], cached[2]
+    _, v1_api = initialize_twitter_clients()
+    result = await asyncio.to_thread(v1_api.get_place_trends, woeid)
+    trends = result[0]["trends"]
+    by_category: Dict[str, list] = {}
+    for trend in trends:
+        by_category.setdefault(trend.get("category"), []).append(trend)
+    _trends_cache[woeid] = (now + _TRENDS_CACHE_TTL_NS, trends, by_category)
+    return trends, by_category
 
 @server.tool(name="get_trends", description="Retrieves trending topics on Twitter")
 async def get_trends(category: Optional[str] = None, count: Optional[int] = 50) -> List[Dict]:
@@ -513,12 +794,10 @@ async def get_trends(category: Optional[str] = None, count: Optional[int] = 50)
         category (Optional[str]): Filter trends by category (e.g., 'Sports', 'News'). Currently not directly supported by `get_place_trends` for worldwide, will filter locally if provided.
         count (Optional[int]): Number of trending topics to retrieve. Default 50. Max 50 (as per Twitter API v1.1 default).
     """
-    _, v1_api = initialize_twitter_clients()
     # Twitter API v2 trends require a location; use v1.1 for trends
-    trends = v1_api.get_place_trends(id=1)  # WOEID 1 = Worldwide
-    trends = trends[0]["trends"]
+    trends, by_category = await _fetch_trends(1)  # WOEID 1 = Worldwide
     if category:
-        trends = [t for t in trends if t.get("category") == category]
+        trends = by_category.get(category, [])
     return trends[:count]
 
 @server.tool(name="get_highlights_tweets", description="Retrieves highlighted tweets from a user's timeline (simulated)")
@@ -532,8 +811,8 @@ async def get_highlights_tweets(user_id: str, count: Optional[int] = 100, cursor
     """
     client, _ = initialize_twitter_clients()
     # Twitter API v2 doesn't have highlights; use user timeline
-    tweets = client.get_users_tweets(id=user_id, max_results=count, pagination_token=cursor, tweet_fields=["id", "text", "created_at"])
-    return [tweet.data for tweet in (tweets.data or [])]
+    tweets = await _t(client.get_users_tweets, id=user_id, max_results=count, pagination_token=cursor, tweet_fields=_TWEET_FIELDS)
+    return [tweet.data for tweet in tweets.data] if tweets.data else []
 
 @server.tool(name="get_user_mentions", description="Get tweets mentioning a specific user")
 async def get_user_mentions(user_id: str, count: Optional[int] = 100, cursor: Optional[str] = None) -> List[Dict]:
@@ -545,8 +824,8 @@ async def get_user_mentions(user_id: str, count: Optional[int] = 100, cursor: Op
         cursor (Optional[str]): Pagination token for fetching the next set of results.
     """
     client, _ = initialize_twitter_clients()
-    mentions = client.get_users_mentions(id=user_id, max_results=count, pagination_token=cursor, tweet_fields=["id", "text", "created_at"])
-    return [tweet.data for tweet in (mentions.data or [])]
+    mentions = await _t(client.get_users_mentions, id=user_id, max_results=count, pagination_token=cursor, tweet_fields=_TWEET_FIELDS)
+    return [tweet.data for tweet in mentions.data] if mentions.data else []
 
 # Main server execution
 def run():